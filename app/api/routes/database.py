@@ -6,6 +6,7 @@ from fastapi import APIRouter, HTTPException, Query as QueryParam
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from collections import deque
 from tinydb import Query
 
 # Import database tables and models
@@ -56,7 +57,9 @@ async def get_database_statistics():
         stats = get_database_stats()
         
         # Add more detailed stats
-        recent_emails = emails_table.all()[-10:] if emails_table.all() else []
+        # Iterate the table lazily and keep only the last 10 rows instead of
+        # materializing the full email list (twice) just to slice it
+        recent_emails = deque(emails_table, maxlen=10)
         
         detailed_stats = {
             **stats,
@@ -86,27 +89,27 @@ async def list_database_tables():
         "tables": {
             "emails": {
                 "description": "Email messages and processing data",
-                "count": len(emails_table.all()),
+                "count": len(emails_table),
                 "fields": ["id", "sender", "subject", "body", "received_at", "status", "priority_level"]
             },
             "replies": {
                 "description": "AI-generated replies to emails", 
-                "count": len(replies_table.all()),
+                "count": len(replies_table),
                 "fields": ["id", "email_id", "content", "strategy_used", "sent", "created_date"]
             },
             "action_items": {
                 "description": "Action items extracted from emails",
-                "count": len(action_items_table.all()),
+                "count": len(action_items_table),
                 "fields": ["id", "email_id", "action_data", "status", "created_date"]
             },
             "tenants": {
                 "description": "Tenant information and contacts",
-                "count": len(tenants_table.all()),
+                "count": len(tenants_table),
                 "fields": ["id", "name", "email", "unit", "phone", "rent_amount"]
             },
             "ai_responses": {
                 "description": "AI response options in waiting zone",
-                "count": len(ai_responses_table.all()),
+                "count": len(ai_responses_table),
                 "fields": ["id", "email_id", "response_options", "status", "created_at"]
             }
         }
@@ -125,13 +128,12 @@ async def get_all_emails(
 ):
     """Get all emails with filtering and pagination"""
     try:
-        all_emails = emails_table.all()
-        
-        # Apply filters
-        if status:
-            all_emails = [e for e in all_emails if e.get("status") == status]
+        # Apply the exact-match filter inside the table scan
+        Email = Query()
+        all_emails = emails_table.search(Email.status == status) if status else emails_table.all()
         if sender:
-            all_emails = [e for e in all_emails if sender.lower() in e.get("sender", "").lower()]
+            sender_lower = sender.lower()
+            all_emails = [e for e in all_emails if sender_lower in e.get("sender", "").lower()]
         
         # Sort by received_at (most recent first)
         sorted_emails = sorted(
@@ -404,13 +406,9 @@ async def get_all_action_items(
 ):
     """Get all action items with filtering"""
     try:
-        all_items = action_items_table.all()
-        
-        # Apply filters
-        if status:
-            all_items = [item for item in all_items if item.get("status") == status]
-        if email_id:
-            all_items = [item for item in all_items if item.get("email_id") == email_id]
+        # Apply filters inside the table scan with a single predicate
+        filters = {key: value for key, value in (("status", status), ("email_id", email_id)) if value}
+        all_items = action_items_table.search(Query().fragment(filters)) if filters else action_items_table.all()
         
         # Sort by created_date (most recent first)
         sorted_items = sorted(
@@ -560,13 +558,9 @@ async def get_all_ai_responses(
 ):
     """Get all AI responses with filtering"""
     try:
-        all_responses = ai_responses_table.all()
-        
-        # Apply filters
-        if status:
-            all_responses = [r for r in all_responses if r.get("status") == status]
-        if email_id:
-            all_responses = [r for r in all_responses if r.get("email_id") == email_id]
+        # Apply filters inside the table scan with a single predicate
+        filters = {key: value for key, value in (("status", status), ("email_id", email_id)) if value}
+        all_responses = ai_responses_table.search(Query().fragment(filters)) if filters else ai_responses_table.all()
         
         # Sort by created_at (most recent first)
         sorted_responses = sorted(
@@ -616,14 +610,46 @@ async def bulk_delete_emails(email_ids: List[str]):
     try:
         deleted_count = 0
         errors = []
-        
+        requested = set(email_ids)
+        numeric_ids = {}
+        for email_id in requested:
+            if email_id.isdigit():
+                numeric_ids.setdefault(int(email_id), []).append(email_id)
+        
+        # Resolve every id in one pass over the emails table, matching by
+        # doc_id first and by the id field otherwise (as delete_email does)
+        by_doc_id = {}
+        by_field = {}
+        for email in emails_table:
+            for email_id in numeric_ids.get(email.doc_id, ()):
+                by_doc_id[email_id] = email.doc_id
+            if email.get("id") in requested:
+                by_field.setdefault(email["id"], []).append(email.doc_id)
+        
+        doc_ids = set()
+        deleted_ids = set()
         for email_id in email_ids:
-            try:
-                # Delete email and related data (reuse single delete logic)
-                await delete_email(email_id)
-                deleted_count += 1
-            except Exception as e:
-                errors.append(f"Error deleting email {email_id}: {str(e)}")
+            if email_id in deleted_ids:
+                matched = None
+            elif email_id in by_doc_id:
+                matched = [by_doc_id[email_id]]
+            else:
+                matched = by_field.get(email_id)
+            
+            if not matched:
+                errors.append(f"Error deleting email {email_id}: 404: Email not found")
+                continue
+            doc_ids.update(matched)
+            deleted_ids.add(email_id)
+            deleted_count += 1
+        
+        # Delete related data and the emails with one write per table
+        if deleted_ids:
+            Email = Query()
+            replies_table.remove(Email.email_id.one_of(deleted_ids))
+            action_items_table.remove(Email.email_id.one_of(deleted_ids))
+            ai_responses_table.remove(Email.email_id.one_of(deleted_ids))
+            emails_table.remove(doc_ids=doc_ids)
         
         return {
             "success": True,
@@ -639,28 +665,22 @@ async def bulk_delete_emails(email_ids: List[str]):
 async def bulk_update_action_items_status(item_ids: List[str], new_status: str):
     """Update status for multiple action items"""
     try:
-        updated_count = 0
         errors = []
         
-        for item_id in item_ids:
-            try:
-                # Update action item status
-                ActionItemQuery = Query()
-                result = action_items_table.update(
-                    {
-                        "status": new_status,
-                        "updated_date": datetime.now().isoformat()
-                    },
-                    ActionItemQuery.id == item_id
-                )
-                if result:
-                    updated_count += 1
-            except Exception as e:
-                errors.append(f"Error updating item {item_id}: {str(e)}")
+        # One pass over the table updates every requested item at once
+        # instead of reading and rewriting the file once per item
+        ActionItemQuery = Query()
+        updated_ids = action_items_table.update(
+            {
+                "status": new_status,
+                "updated_date": datetime.now().isoformat()
+            },
+            ActionItemQuery.id.one_of(set(item_ids))
+        )
         
         return {
             "success": True,
-            "updated_count": updated_count,
+            "updated_count": len(updated_ids),
             "total_requested": len(item_ids),
             "new_status": new_status,
             "errors": errors
@@ -681,11 +701,11 @@ async def search_emails(
 ):
     """Search emails by content"""
     try:
-        all_emails = emails_table.all()
         matching_emails = []
         query_lower = query.lower()
         
-        for email in all_emails:
+        # Iterate the table lazily so hitting the limit stops building Documents
+        for email in emails_table:
             match_found = False
             
             if search_in in ["all", "subject"] and query_lower in email.get("subject", "").lower():
@@ -720,19 +740,19 @@ async def get_daily_summary(date: Optional[str] = QueryParam(None, description="
         
         # Get emails for the day
         daily_emails = [
-            email for email in emails_table.all()
+            email for email in emails_table
             if email.get("received_at", "").startswith(target_date)
         ]
         
         # Get action items for the day
         daily_action_items = [
-            item for item in action_items_table.all()
+            item for item in action_items_table
             if item.get("created_date", "").startswith(target_date)
         ]
         
         # Get replies for the day
         daily_replies = [
-            reply for reply in replies_table.all()
+            reply for reply in replies_table
             if reply.get("created_date", "").startswith(target_date)
         ]
         
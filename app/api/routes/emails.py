@@ -5,16 +5,21 @@ Email Management API - High-level email operations and management
 from fastapi import APIRouter, HTTPException, Query as QueryParam
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta
+from collections import Counter, defaultdict
 
 # Import email processing components
-from ...plugin.email.process_emails import get_email_by_id, get_recent_emails, get_replies_for_email
+from ...plugin.email.process_emails import (
+    get_email_by_id, get_recent_emails, get_replies_for_email, EmailProcessor
+)
 from ...plugin.ai.ai_response import (
     get_pending_ai_responses, 
     select_ai_response,
+    save_ai_responses_to_waiting_zone,
     LangChainAIResponder
 )
-from ...models import emails_table, replies_table, ai_responses_table
+from ...models import emails_table, replies_table, action_items_table, ai_responses_table
+from ...plugin.tickets.manager import Ticket
 from tinydb import Query
 
 from ...llm_config import llm_config
@@ -75,16 +80,15 @@ async def list_emails(
             else:
                 filtered_emails = [e for e in filtered_emails if not e.get("tickets_created")]
         
+        # Count replies per email with one pass over the replies table
+        # instead of searching it once per email
+        reply_counts = Counter(reply.get("email_id") for reply in replies_table)
+        
         if has_replies is not None:
-            for email in filtered_emails[:]:  # Copy list to modify during iteration
-                email_id = email.get("id", str(email.doc_id))
-                replies = get_replies_for_email(email_id)
-                has_reply = len(replies) > 0
-                
-                if has_replies and not has_reply:
-                    filtered_emails.remove(email)
-                elif not has_replies and has_reply:
-                    filtered_emails.remove(email)
+            filtered_emails = [
+                e for e in filtered_emails
+                if (reply_counts[e.get("id", str(e.doc_id))] > 0) == has_replies
+            ]
         
         # Sort by received_at (most recent first)
         sorted_emails = sorted(
@@ -100,11 +104,10 @@ async def list_emails(
         enhanced_emails = []
         for email in paginated:
             email_id = email.get("id", str(email.doc_id))
-            replies = get_replies_for_email(email_id)
             
             enhanced_email = {
                 **email,
-                "reply_count": len(replies),
+                "reply_count": reply_counts[email_id],
                 "ticket_count": len(email.get("tickets_created", [])),
                 "has_pending_ai_responses": bool(email.get("ai_response_id"))
             }
@@ -141,7 +144,6 @@ async def get_email_details(email_id: str):
         replies = get_replies_for_email(email_id)
         
         # Get action items
-        from ...models import action_items_table
         ActionItem = Query()
         action_items = action_items_table.search(ActionItem.email_id == email_id)
         
@@ -152,7 +154,6 @@ async def get_email_details(email_id: str):
         # Get tickets
         tickets_info = []
         if email.get("tickets_created"):
-            from ...plugin.tickets.manager import Ticket
             for ticket_id in email["tickets_created"]:
                 ticket = Ticket.get_by_id(ticket_id)
                 if ticket:
@@ -344,7 +345,6 @@ async def regenerate_ai_responses(email_id: str):
         response_options = ai_responder.generate_reply(email_data, email_id)
         
         # Save to waiting zone
-        from ...plugin.ai.ai_response import save_ai_responses_to_waiting_zone
         ai_response_id = save_ai_responses_to_waiting_zone(email_id, response_options)
         
         return {
@@ -368,11 +368,11 @@ async def regenerate_ai_responses(email_id: str):
 async def search_emails(request: EmailSearchRequest):
     """Advanced email search"""
     try:
-        all_emails = emails_table.all()
         matching_emails = []
         query_lower = request.query.lower()
         
-        for email in all_emails:
+        # Iterate the table lazily so hitting the limit stops building Documents
+        for email in emails_table:
             match_found = False
             match_details = []
             
@@ -416,45 +416,39 @@ async def search_emails(request: EmailSearchRequest):
 async def get_email_analytics():
     """Get email analytics and summary statistics"""
     try:
-        all_emails = emails_table.all()
-        
-        # Basic counts
-        total_emails = len(all_emails)
-        
-        # Status distribution
-        status_counts = {}
-        for email in all_emails:
-            status = email.get("status", "unknown")
-            status_counts[status] = status_counts.get(status, 0) + 1
-        
-        # Priority distribution
-        priority_counts = {}
-        for email in all_emails:
-            priority = email.get("priority_level", "unknown")
-            priority_counts[priority] = priority_counts.get(priority, 0) + 1
-        
-        # Context label distribution
-        context_counts = {}
-        for email in all_emails:
-            for label in email.get("context_labels", []):
-                context_counts[label] = context_counts.get(label, 0) + 1
-        
-        # Ticket creation statistics
-        emails_with_tickets = [e for e in all_emails if e.get("tickets_created")]
-        total_tickets_created = sum(len(e.get("tickets_created", [])) for e in all_emails)
-        
-        # Recent activity (last 7 days)
-        from datetime import datetime, timedelta
         week_ago = (datetime.now() - timedelta(days=7)).isoformat()
-        recent_emails = [e for e in all_emails if e.get("received_at", "") > week_ago]
+        
+        total_emails = 0
+        status_counts = Counter()
+        priority_counts = Counter()
+        context_counts = Counter()
+        emails_with_tickets = 0
+        total_tickets_created = 0
+        recent_emails = 0
+        
+        # Single lazy pass over the table accumulates every distribution
+        for email in emails_table:
+            total_emails += 1
+            status_counts[email.get("status", "unknown")] += 1
+            priority_counts[email.get("priority_level", "unknown")] += 1
+            context_counts.update(email.get("context_labels", []))
+            
+            tickets_created = email.get("tickets_created")
+            if tickets_created:
+                emails_with_tickets += 1
+                total_tickets_created += len(tickets_created)
+            
+            # Recent activity (last 7 days)
+            if email.get("received_at", "") > week_ago:
+                recent_emails += 1
         
         return {
             "generated_at": datetime.now().isoformat(),
             "overview": {
                 "total_emails": total_emails,
-                "emails_with_tickets": len(emails_with_tickets),
+                "emails_with_tickets": emails_with_tickets,
                 "total_tickets_created": total_tickets_created,
-                "recent_emails_7days": len(recent_emails)
+                "recent_emails_7days": recent_emails
             },
             "distributions": {
                 "by_status": status_counts,
@@ -462,9 +456,9 @@ async def get_email_analytics():
                 "by_context": context_counts
             },
             "performance_metrics": {
-                "ticket_creation_rate": len(emails_with_tickets) / total_emails if total_emails > 0 else 0,
+                "ticket_creation_rate": emails_with_tickets / total_emails if total_emails > 0 else 0,
                 "avg_tickets_per_email": total_tickets_created / total_emails if total_emails > 0 else 0,
-                "weekly_activity": len(recent_emails)
+                "weekly_activity": recent_emails
             }
         }
         
@@ -478,9 +472,6 @@ async def get_email_trends(days: int = QueryParam(30, ge=1, le=365)):
         all_emails = emails_table.all()
         
         # Group emails by date
-        from datetime import datetime, timedelta
-        from collections import defaultdict
-        
         daily_counts = defaultdict(lambda: {
             "received": 0,
             "processed": 0,
@@ -551,7 +542,6 @@ async def reprocess_email(email_id: str):
             raise HTTPException(status_code=404, detail="Email not found")
         
         # Trigger reprocessing
-        from ...plugin.email.process_emails import EmailProcessor
         email_processor = EmailProcessor()
         
         email_data = {
@@ -600,7 +590,6 @@ async def get_email_workflow_status(email_id: str):
         replies = get_replies_for_email(email_id)
         
         # Get action items
-        from ...models import action_items_table
         ActionItem = Query()
         action_items = action_items_table.search(ActionItem.email_id == email_id)
         
@@ -611,7 +600,6 @@ async def get_email_workflow_status(email_id: str):
         # Get tickets
         tickets = []
         if email.get("tickets_created"):
-            from ...plugin.tickets.manager import Ticket
             for ticket_id in email["tickets_created"]:
                 ticket = Ticket.get_by_id(ticket_id)
                 if ticket:
@@ -687,29 +675,43 @@ async def bulk_update_email_status(request: BulkUpdateStatusRequest):
         updated_count = 0
         errors = []
         
+        update_data = {
+            "status": request.new_status,
+            "updated_at": datetime.now().isoformat()
+        }
+        
+        if request.notes:
+            update_data["bulk_update_notes"] = request.notes
+        
+        numeric_ids = {int(email_id) for email_id in request.email_ids if email_id.isdigit()}
+        field_ids = {email_id for email_id in request.email_ids if not email_id.isdigit()}
+        
+        # Resolve every requested email in one pass (doc_id for numeric IDs,
+        # the id field otherwise) so the update is a single table write
+        doc_ids = set()
+        found_doc_ids = set()
+        found_field_ids = set()
+        for email in emails_table:
+            if email.doc_id in numeric_ids:
+                doc_ids.add(email.doc_id)
+                found_doc_ids.add(email.doc_id)
+            if email.get("id") in field_ids:
+                doc_ids.add(email.doc_id)
+                found_field_ids.add(email["id"])
+        
+        if doc_ids:
+            emails_table.update(update_data, doc_ids=doc_ids)
+        
         for email_id in request.email_ids:
-            try:
-                # Update email status
-                update_data = {
-                    "status": request.new_status,
-                    "updated_at": datetime.now().isoformat()
-                }
-                
-                if request.notes:
-                    update_data["bulk_update_notes"] = request.notes
-                
-                # Update in database
-                if email_id.isdigit():
-                    result = emails_table.update(update_data, doc_ids=[int(email_id)])
-                else:
-                    Email = Query()
-                    result = emails_table.update(update_data, Email.id == email_id)
-                
-                if result:
-                    updated_count += 1
-                    
-            except Exception as e:
-                errors.append(f"Error updating email {email_id}: {str(e)}")
+            if email_id.isdigit():
+                found = int(email_id) in found_doc_ids
+            else:
+                found = email_id in found_field_ids
+            
+            if found:
+                updated_count += 1
+            else:
+                errors.append(f"Error updating email {email_id}: Email not found")
         
         return {
             "success": True,
@@ -756,7 +758,6 @@ async def bulk_generate_ai_responses(email_ids: List[str]):
                 response_options = ai_responder.generate_reply(email_data, email_id)
                 
                 # Save to waiting zone
-                from ...plugin.ai.ai_response import save_ai_responses_to_waiting_zone
                 ai_response_id = save_ai_responses_to_waiting_zone(email_id, response_options)
                 
                 results.append({
@@ -4,13 +4,18 @@ Provides RESTful endpoints for ticket management
 """
 
 from fastapi import APIRouter, HTTPException, Query as QueryParam
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
-from ...plugin.tickets.manager import Ticket, get_ticket_statistics, get_open_tickets
-from ...plugin.tickets.models import TicketStatus, TicketCategory, TicketUrgency
-from ...plugin.tickets.utils import search_tickets, generate_ticket_report, export_tickets_to_csv
+from ...plugin.tickets.manager import (
+    Ticket, get_ticket_statistics, get_open_tickets, bulk_assign_tickets, bulk_update_status
+)
+from ...plugin.tickets.models import TicketData, TicketStatus, TicketCategory, TicketUrgency
+from ...plugin.tickets.utils import (
+    search_tickets, generate_ticket_report, export_tickets_to_csv, iter_tickets_csv
+)
 
 router = APIRouter(prefix="/tickets", tags=["Tickets"])
 
@@ -57,22 +62,13 @@ async def get_tickets(
 ):
     """Get tickets with optional filtering"""
     try:
-        from ...plugin.tickets.models import TicketData
-        
-        # Get all tickets first
-        all_tickets = TicketData.get_all(limit=10000)
-        
-        # Apply filters
-        filtered_tickets = all_tickets
-        
-        if status:
-            filtered_tickets = [t for t in filtered_tickets if t.get('status') == status]
-        
-        if category:
-            filtered_tickets = [t for t in filtered_tickets if t.get('category') == category]
-        
-        if urgency:
-            filtered_tickets = [t for t in filtered_tickets if t.get('urgency') == urgency]
+        # Filter inside the table scan
+        filters = {
+            field: value
+            for field, value in (('status', status), ('category', category), ('urgency', urgency))
+            if value
+        }
+        filtered_tickets = TicketData.find(filters)
         
         # Apply pagination
         total = len(filtered_tickets)
@@ -210,8 +206,6 @@ async def batch_assign_tickets_endpoint(
 ):
     """Assign multiple tickets to a person/group"""
     try:
-        from ...plugin.tickets.manager import bulk_assign_tickets
-        
         result = bulk_assign_tickets(ticket_ids, assigned_to, assignment_group)
         return {
             "message": f"Assigned {result['successful_count']}/{result['total_count']} tickets successfully",
@@ -231,8 +225,6 @@ async def batch_update_ticket_status_endpoint(
 ):
     """Update status for multiple tickets"""
     try:
-        from ...plugin.tickets.manager import bulk_update_status
-        
         try:
             status_enum = TicketStatus(status)
         except ValueError:
@@ -258,16 +250,9 @@ async def export_tickets_csv(
 ):
     """Export tickets to CSV format"""
     try:
-        from ...plugin.tickets.models import TicketData
-        
         # Get tickets with filters
-        all_tickets = TicketData.get_all(limit=10000)
-        
-        if status:
-            all_tickets = [t for t in all_tickets if t.get('status') == status]
-        
-        if category:
-            all_tickets = [t for t in all_tickets if t.get('category') == category]
+        filters = {field: value for field, value in (('status', status), ('category', category)) if value}
+        all_tickets = TicketData.find(filters)[:10000]
         
         csv_content = export_tickets_to_csv(all_tickets)
         
@@ -280,6 +265,27 @@ async def export_tickets_csv(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error exporting tickets: {str(e)}")
 
+@router.get("/export/csv/stream")
+async def stream_tickets_csv(
+    status: Optional[str] = QueryParam(None),
+    category: Optional[str] = QueryParam(None)
+):
+    """Export tickets as a streamed CSV file download"""
+    try:
+        # Get tickets with filters
+        filters = {field: value for field, value in (('status', status), ('category', category)) if value}
+        all_tickets = TicketData.find(filters)[:10000]
+        
+        filename = f"tickets_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        return StreamingResponse(
+            iter_tickets_csv(all_tickets),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error exporting tickets: {str(e)}")
+
 @router.get("/health")
 async def route_health_status():
   return {"status": "Healthy!"}
\ No newline at end of file
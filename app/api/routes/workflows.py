@@ -8,6 +8,9 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 import asyncio
 import logging
+import uuid
+
+from tinydb import Query
 
 # Import your email processing functions
 from ...plugin.email.process_emails import (
@@ -19,7 +22,9 @@ from ...plugin.email.process_emails import (
 from ...plugin.email.gmail_client import GmailClient
 from ...plugin.email.email_processor import EmailProcessor
 from ...plugin.ai.ai_response import LangChainAIResponder, save_ai_responses_to_waiting_zone
-from ...plugin.tickets.manager import Ticket, push_ticket
+from ...plugin.tickets.manager import Ticket, push_tickets
+from ...plugin.tickets.models import get_ticket_statistics
+from ...models import ActionItem, ActionStatus, EmailStatus, emails_table, action_items_table
 from ...llm_config import llm_config
 
 router = APIRouter()
@@ -54,7 +59,6 @@ workflow_status = {}
 
 def generate_workflow_id() -> str:
     """Generate unique workflow ID"""
-    import uuid
     return f"wf_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
 
 # ============================================================================
@@ -209,7 +213,6 @@ async def process_single_email(email_id: str):
         logger.info(f"Processing email {email_id}: {email.get('subject', 'No subject')}")
         
         # FIX: Use EmailProcessor to properly process the email
-        from ...plugin.email.email_processor import EmailProcessor
         email_processor = EmailProcessor()
         
         # Prepare email data for processing
@@ -226,36 +229,27 @@ async def process_single_email(email_id: str):
         
         logger.info(f"Extracted {len(action_items)} action items")
         
-        # Save action items to database
-        from ...models import ActionItem, ActionStatus
-        for action_data in action_items:
-            ActionItem.create(
-                email_id=email_id,
-                action_data=action_data,
-                status=ActionStatus.OPEN
-            )
-            logger.info(f"Saved action item: {action_data.get('action', 'unknown')}")
-        
-        # Update email status to processed
-        from ...models import EmailMessage, EmailStatus
-        EmailMessage.update_status(email_id, EmailStatus.PROCESSED)
+        # Save action items to database in a single insert
+        if action_items:
+            ActionItem.create_many(email_id, action_items, status=ActionStatus.OPEN)
+            for action_data in action_items:
+                logger.info(f"Saved action item: {action_data.get('action', 'unknown')}")
         
-        # Update email record with processing info
-        from ...models import emails_table
-        from tinydb import Query
+        # Mark the email processed and record processing info in one write
         Email = Query()
+        now = datetime.now().isoformat()
         
         emails_table.update({
             'action_items_count': len(action_items),
             'status': EmailStatus.PROCESSED.value,
-            'processed_at': datetime.now().isoformat()
+            'processed_at': now
         }, Email.id == email_id)
         
         processing_result = {
             'email_id': email_id,
             'action_items_count': len(action_items),
             'status': EmailStatus.PROCESSED.value,
-            'processed_at': datetime.now().isoformat()
+            'processed_at': now
         }
         
         logger.info(f"Successfully processed email {email_id}")
@@ -336,11 +330,8 @@ async def create_tickets_from_email_endpoint(request: TicketCreationRequest):
         logger.info(f"Found email: {email.get('subject', 'No subject')}")
         
         # Get action items from database
-        from ...models import action_items_table
-        from tinydb import Query
-        
-        ActionItem = Query()
-        action_items = action_items_table.search(ActionItem.email_id == request.email_id)
+        ActionItemQuery = Query()
+        action_items = action_items_table.search(ActionItemQuery.email_id == request.email_id)
         
         logger.info(f"Found {len(action_items)} action items for email {request.email_id}")
         
@@ -375,16 +366,16 @@ async def create_tickets_from_email_endpoint(request: TicketCreationRequest):
         
         # Create tickets from action items
         created_tickets = []
+        ticket_refs = []
         errors = []
         
+        pending = []
+        
         for i, action_item in enumerate(action_items):
             try:
                 logger.info(f"Creating ticket {i+1}/{len(action_items)} from action item {action_item.get('id')}")
                 logger.info(f"Action item data: {action_item.get('action_data', {})}")
                 
-                # Import ticket classes
-                from ...plugin.tickets.manager import Ticket, push_ticket
-                
                 # Create ticket instance
                 ticket = Ticket(email_data, action_item)
                 
@@ -395,26 +386,7 @@ async def create_tickets_from_email_endpoint(request: TicketCreationRequest):
                     errors.append(error_msg)
                     continue
                 
-                # Save ticket
-                ticket_id = push_ticket(ticket)
-                
-                if ticket_id:
-                    created_tickets.append(ticket_id)
-                    
-                    # Update action item with ticket reference
-                    action_items_table.update(
-                        {
-                            'ticket_id': ticket_id, 
-                            'ticket_created_at': datetime.now().isoformat()
-                        },
-                        ActionItem.id == action_item['id']
-                    )
-                    
-                    logger.info(f"✅ Created ticket {ticket_id} from action item {action_item.get('id')}")
-                else:
-                    error_msg = f"Failed to save ticket for action item {action_item.get('id')}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
+                pending.append((action_item, ticket))
                 
             except Exception as action_error:
                 error_msg = f"Error creating ticket from action item {action_item.get('id')}: {action_error}"
@@ -422,14 +394,35 @@ async def create_tickets_from_email_endpoint(request: TicketCreationRequest):
                 errors.append(error_msg)
                 continue
         
+        # Save all validated tickets with a single write
+        ticket_ids = push_tickets([ticket for _, ticket in pending])
+        for (action_item, _), ticket_id in zip(pending, ticket_ids):
+            if ticket_id:
+                created_tickets.append(ticket_id)
+                ticket_refs.append((action_item['id'], ticket_id))
+                
+                logger.info(f"✅ Created ticket {ticket_id} from action item {action_item.get('id')}")
+            else:
+                error_msg = f"Failed to save ticket for action item {action_item.get('id')}"
+                logger.error(error_msg)
+                errors.append(error_msg)
+        
+        now = datetime.now().isoformat()
+        
+        # Update action items with their ticket references in a single write
+        if ticket_refs:
+            action_items_table.update_multiple([
+                ({'ticket_id': ticket_id, 'ticket_created_at': now}, ActionItemQuery.id == item_id)
+                for item_id, ticket_id in ticket_refs
+            ])
+        
         # Update email record with created tickets
         if created_tickets:
-            from ...models import emails_table
             Email = Query()
             emails_table.update(
                 {
                     'tickets_created': created_tickets,
-                    'tickets_created_at': datetime.now().isoformat()
+                    'tickets_created_at': now
                 }, 
                 Email.id == request.email_id
             )
@@ -513,8 +506,7 @@ async def workflow_health_check():
         
         # Test database
         try:
-            from ...models import emails_table
-            email_count = len(emails_table.all())
+            email_count = len(emails_table)
             health_status["components"]["database"] = {
                 "status": "healthy",
                 "email_count": email_count
@@ -542,7 +534,6 @@ async def workflow_health_check():
         
         # Test ticket system
         try:
-            from ...plugin.tickets.models import get_ticket_statistics
             stats = get_ticket_statistics()
             health_status["components"]["ticket_system"] = {
                 "status": "healthy",
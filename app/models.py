@@ -1,22 +1,30 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any, Union
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 from tinydb import TinyDB, Query
+from tinydb.table import Document
+from itertools import islice
 import hashlib
+import heapq
 import uuid
 
 # Initialize TinyDB
 db = TinyDB('email_system.json')
 
+# TinyDB keeps a per-table LRU of query results and drops it on every write
+# to that table; the default of 10 entries is too small for the per-email
+# lookups (replies, action items, AI responses by email_id) the API repeats
+QUERY_CACHE_SIZE = 256
+
 # Define tables
-emails_table = db.table('emails')
-replies_table = db.table('replies')
-action_items_table = db.table('action_items')
+emails_table = db.table('emails', cache_size=QUERY_CACHE_SIZE)
+replies_table = db.table('replies', cache_size=QUERY_CACHE_SIZE)
+action_items_table = db.table('action_items', cache_size=QUERY_CACHE_SIZE)
 tenants_table = db.table('tenants')
 response_feedback_table = db.table('response_feedback')
 context_patterns_table = db.table('context_patterns')
-ai_responses_table = db.table('ai_responses')
+ai_responses_table = db.table('ai_responses', cache_size=QUERY_CACHE_SIZE)
 
 # Enums
 class EmailStatus(str, Enum):
@@ -89,8 +97,8 @@ class EmailMessage:
     """Email message model for TinyDB operations"""
     
     @staticmethod
-    def create(sender: str, subject: str, body: str, **kwargs) -> int:
-        """Create a new email message"""
+    def create(sender: str, subject: str, body: str, return_record: bool = False, **kwargs) -> Union[int, Dict]:
+        """Create a new email message, returning its doc_id (or the stored record)"""
         email_data = {
             'id': str(uuid.uuid4()),
             'sender': sender,
@@ -106,7 +114,9 @@ class EmailMessage:
             'sentiment_score': kwargs.get('sentiment_score'),
             'urgency_score': kwargs.get('urgency_score')
         }
-        return emails_table.insert(email_data)
+        doc_id = emails_table.insert(email_data)
+        # The record is already in hand, so callers that need it skip a lookup
+        return Document(email_data, doc_id=doc_id) if return_record else doc_id
     
     @staticmethod
     def get_by_id(email_id: str) -> Optional[Dict]:
@@ -117,8 +127,8 @@ class EmailMessage:
     @staticmethod
     def get_all(limit: int = 100, skip: int = 0) -> List[Dict]:
         """Get all emails with pagination"""
-        all_emails = emails_table.all()
-        return all_emails[skip:skip + limit]
+        # Slice the lazy table iterator instead of building every Document
+        return list(islice(emails_table, skip, skip + limit))
     
     @staticmethod
     def update_status(email_id: str, status: EmailStatus) -> bool:
@@ -166,16 +176,34 @@ class ActionItem:
     @staticmethod
     def create(email_id: str, action_data: Dict, **kwargs) -> int:
         """Create a new action item"""
+        now = datetime.now().isoformat()
         action_item_data = {
             'id': str(uuid.uuid4()),
             'email_id': email_id,
             'action_data': action_data,
             'status': kwargs.get('status', ActionStatus.OPEN.value),
-            'created_date': datetime.now().isoformat(),
-            'updated_date': datetime.now().isoformat()
+            'created_date': now,
+            'updated_date': now
         }
         return action_items_table.insert(action_item_data)
     
+    @staticmethod
+    def create_many(email_id: str, action_data_list: List[Dict], **kwargs) -> List[int]:
+        """Create several action items for one email with a single write"""
+        now = datetime.now().isoformat()
+        status = kwargs.get('status', ActionStatus.OPEN.value)
+        return action_items_table.insert_multiple([
+            {
+                'id': str(uuid.uuid4()),
+                'email_id': email_id,
+                'action_data': action_data,
+                'status': status,
+                'created_date': now,
+                'updated_date': now
+            }
+            for action_data in action_data_list
+        ])
+    
     @staticmethod
     def get_by_email_id(email_id: str) -> List[Dict]:
         """Get all action items for an email"""
@@ -257,11 +285,8 @@ class ResponseFeedback:
     @staticmethod
     def get_recent_feedback(limit: int = 50) -> List[Dict]:
         """Get recent feedback"""
-        all_feedback = response_feedback_table.all()
-        sorted_feedback = sorted(all_feedback, 
-                               key=lambda x: x.get('created_date', ''), 
-                               reverse=True)
-        return sorted_feedback[:limit]
+        # Only keep the newest `limit` entries instead of sorting them all
+        return heapq.nlargest(limit, response_feedback_table, key=lambda x: x.get('created_date', ''))
 
 class ContextPattern:
     """Context pattern model for TinyDB operations"""
@@ -304,8 +329,6 @@ class ContextPattern:
 # Utility functions
 def cleanup_old_records(days_old: int = 30):
     """Clean up old records from all tables"""
-    from datetime import timedelta
-    
     cutoff_date = (datetime.now() - timedelta(days=days_old)).isoformat()
     
     # Clean up old emails and related data
@@ -313,16 +336,16 @@ def cleanup_old_records(days_old: int = 30):
     old_emails = emails_table.search(Email.received_date < cutoff_date)
     old_email_ids = [email['id'] for email in old_emails]
     
-    # Remove associated replies and action items
-    Reply = Query()
-    ActionItem = Query()
-    
-    for email_id in old_email_ids:
-        replies_table.remove(Reply.email_id == email_id)
-        action_items_table.remove(ActionItem.email_id == email_id)
-    
-    # Remove old emails
-    emails_table.remove(Email.received_date < cutoff_date)
+    # Remove associated replies and action items with one write per table
+    if old_email_ids:
+        old_id_set = set(old_email_ids)
+        Reply = Query()
+        ActionItem = Query()
+        replies_table.remove(Reply.email_id.one_of(old_id_set))
+        action_items_table.remove(ActionItem.email_id.one_of(old_id_set))
+        
+        # Remove old emails by the doc IDs already found instead of re-scanning
+        emails_table.remove(doc_ids=[email.doc_id for email in old_emails])
     
     # Clean up old feedback
     Feedback = Query()
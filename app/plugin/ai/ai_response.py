@@ -125,7 +125,7 @@ class LangChainLLMManager:
                 
         # Initialize available models
         self._init_models()
-        print(self.config)
+        logger.debug(f"LLM manager initialized with models: {list(self.models)}")
         
     def _init_models(self):
         """Initialize all available LLM models with modern LangChain"""
@@ -55,30 +55,25 @@ class EmailProcessor:
             context_labels = self._extract_context_labels(email_data)
             
             # Create email record
-            email_id = EmailMessage.create(
+            created_email = EmailMessage.create(
                 sender=email_data['sender'],
                 subject=email_data.get('subject', ''),
                 body=email_data.get('body', ''),
+                return_record=True,
                 status=EmailStatus.PROCESSING,
                 priority_level=priority_level,
                 context_labels=context_labels,
                 processed_date=datetime.now().isoformat()
             )
             
-            # Get the created email record
-            created_email = EmailMessage.get_by_id(email_id)
-            if not created_email:
-                logger.error(f"Failed to retrieve created email with ID: {email_id}")
-                return None
-            
             # Extract and save action items
             action_items = self._extract_action_items(email_data, created_email['id'])
             
-            # Save action items to database
-            for action_data in action_items:
-                ActionItem.create(
+            # Save action items to database in one write
+            if action_items:
+                ActionItem.create_many(
                     email_id=created_email['id'],
-                    action_data=action_data,
+                    action_data_list=action_items,
                     status=ActionStatus.OPEN
                 )
             
@@ -376,7 +371,6 @@ class EmailProcessor:
     
     def _extract_amount(self, content: str) -> Optional[str]:
         """Extract monetary amount from content"""
-        import re
         amount_pattern = r'\$[\d,]+\.?\d*'
         match = re.search(amount_pattern, content)
         return match.group() if match else None
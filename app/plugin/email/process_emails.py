@@ -1,11 +1,12 @@
+import heapq
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from tinydb import TinyDB, Query
 from .gmail_client import GmailClient
 from ...models import db, emails_table,replies_table, action_items_table
 from .email_processor import EmailProcessor
 from ..ai.ai_response import LangChainAIResponder, save_ai_responses_to_waiting_zone
-from ..tickets.manager import Ticket, push_ticket
+from ..tickets.manager import Ticket, push_tickets
 from ...llm_config import llm_config
 
 logger = logging.getLogger(__name__)
@@ -88,17 +89,11 @@ def get_replies_for_email(email_id):
 
 def get_recent_emails(limit=10):
     """Helper function to get recent emails"""
-    all_emails = emails_table.all()
-    # Sort by received_at (most recent first)
-    sorted_emails = sorted(all_emails, 
-                          key=lambda x: x.get('received_at', ''), 
-                          reverse=True)
-    return sorted_emails[:limit]
+    # Keep only the `limit` most recent by received_at instead of sorting them all
+    return heapq.nlargest(limit, emails_table, key=lambda x: x.get('received_at', ''))
 
 def cleanup_old_records(days_old=30):
     """Helper function to clean up old records"""
-    from datetime import datetime, timedelta
-    
     cutoff_date = (datetime.now() - timedelta(days=days_old)).isoformat()
     Email = Query()
     
@@ -106,12 +101,12 @@ def cleanup_old_records(days_old=30):
     old_emails = emails_table.search(Email.received_at < cutoff_date)
     old_email_ids = [email.doc_id for email in old_emails]
     
-    # Remove associated replies
-    for email_id in old_email_ids:
-        replies_table.remove(Email.email_id == email_id)
-    
-    # Remove old emails
-    emails_table.remove(Email.received_at < cutoff_date)
+    if old_email_ids:
+        # Remove associated replies with a single write
+        replies_table.remove(Email.email_id.one_of(set(old_email_ids)))
+        
+        # Remove old emails by the doc IDs already found instead of re-scanning
+        emails_table.remove(doc_ids=old_email_ids)
     
     logger.info(f"Cleaned up {len(old_email_ids)} old email records")
     
@@ -135,30 +130,32 @@ def _create_tickets_from_action_items(email_data, email_id, email_record):
         
         # Add email ID to email_data for ticket creation
         email_data_with_id = {**email_data, 'id': email_id}
+        ticket_refs = []
         
+        # Build every ticket first, then save them all with a single write
+        pending = []
         for action_item in action_items:
             try:
-                # Create ticket using the clean interface
-                ticket = Ticket(email_data_with_id, action_item)
-                ticket_id = push_ticket(ticket)
-                
-                if ticket_id:
-                    created_tickets.append(ticket_id)
-                    
-                    # Update action item with ticket reference
-                    action_items_table.update(
-                        {
-                            'ticket_id': ticket_id, 
-                            'ticket_created_at': datetime.now().isoformat()
-                        },
-                        ActionItem.id == action_item['id']
-                    )
-                    
-                    logger.info(f"Created ticket {ticket_id} from action item {action_item.get('id')}")
-                
+                pending.append((action_item, Ticket(email_data_with_id, action_item)))
             except Exception as action_error:
                 logger.error(f"Error creating ticket from action item {action_item.get('id')}: {action_error}")
                 continue
+        
+        ticket_ids = push_tickets([ticket for _, ticket in pending])
+        for (action_item, _), ticket_id in zip(pending, ticket_ids):
+            if ticket_id:
+                created_tickets.append(ticket_id)
+                ticket_refs.append((action_item['id'], ticket_id))
+                
+                logger.info(f"Created ticket {ticket_id} from action item {action_item.get('id')}")
+        
+        # Update action items with their ticket references in a single write
+        if ticket_refs:
+            now = datetime.now().isoformat()
+            action_items_table.update_multiple([
+                ({'ticket_id': ticket_id, 'ticket_created_at': now}, ActionItem.id == item_id)
+                for item_id, ticket_id in ticket_refs
+            ])
     
     except Exception as e:
         logger.error(f"Error in _create_tickets_from_action_items: {e}")
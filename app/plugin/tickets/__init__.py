@@ -3,7 +3,7 @@ Ticket Management Module
 Clean, professional ticket management system for property management
 """
 
-from .manager import Ticket, push_ticket
+from .manager import Ticket, push_ticket, push_tickets
 from .models import TicketStatus, TicketCategory, TicketUrgency, TicketRequestType
 from .utils import cleanup_old_tickets, generate_ticket_report
 
@@ -11,6 +11,7 @@ from .utils import cleanup_old_tickets, generate_ticket_report
 __all__ = [
     'Ticket',
     'push_ticket',
+    'push_tickets',
     'TicketStatus',
     'TicketCategory', 
     'TicketUrgency',
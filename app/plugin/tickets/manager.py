@@ -7,7 +7,7 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime
 import logging
 
-from .models import TicketData, TicketStatus, AssignmentData
+from .models import TicketData, TicketStatus, AssignmentData, get_ticket_statistics as _ticket_statistics
 from .schema import (
     TicketSchemaValidator, 
     CategoryMapper, 
@@ -17,6 +17,21 @@ from .schema import (
 
 logger = logging.getLogger(__name__)
 
+def _status_update_data(status: TicketStatus, notes: str = None) -> Dict[str, Any]:
+    """Build the fields written by a status change"""
+    now = datetime.now().isoformat()
+    update_data = {'status': status.value, 'updated_at': now}
+    
+    if notes:
+        update_data['status_notes'] = notes
+    
+    if status == TicketStatus.RESOLVED:
+        update_data['resolved_at'] = now
+    elif status == TicketStatus.CLOSED:
+        update_data['closed_at'] = now
+    
+    return update_data
+
 class Ticket:
     """Main Ticket class for creating and managing tickets"""
     
@@ -54,12 +69,15 @@ class Ticket:
             logger.info(f"Category hint: {category_hint}")
             
             # Determine ticket categorization
-            category, request_type = CategoryMapper.determine_category_from_content(content)
-            subcategory = CategoryMapper.determine_subcategory(content, category)
-            urgency = CategoryMapper.determine_urgency(content)
+            content_lower = content.lower()
+            classification = CategoryMapper.classify(content_lower, lowered=True)
+            category = classification['category']
+            request_type = classification['request_type']
+            subcategory = classification['subcategory']
+            urgency = classification['urgency']
             
             # Extract property/unit information
-            unit_info = PropertyInfoExtractor.extract_unit_info(content)
+            unit_info = PropertyInfoExtractor.extract_unit_info(content_lower, lowered=True)
             property_id = PropertyInfoExtractor.generate_property_id(unit_info)
             
             # Get assignment information
@@ -211,17 +229,7 @@ class Ticket:
     def update_status(cls, ticket_id: str, status: TicketStatus, notes: str = None) -> bool:
         """Update ticket status"""
         try:
-            update_data = {'status': status.value}
-            
-            if notes:
-                update_data['status_notes'] = notes
-            
-            if status == TicketStatus.RESOLVED:
-                update_data['resolved_at'] = datetime.now().isoformat()
-            elif status == TicketStatus.CLOSED:
-                update_data['closed_at'] = datetime.now().isoformat()
-            
-            return TicketData.update(ticket_id, update_data)
+            return TicketData.update(ticket_id, _status_update_data(status, notes))
             
         except Exception as e:
             logger.error(f"Error updating ticket status: {e}")
@@ -290,6 +298,46 @@ def push_ticket(ticket: Ticket) -> Optional[str]:
         logger.error(f"Exception args: {e.args}")
         return None
 
+def push_tickets(tickets: List[Ticket]) -> List[Optional[str]]:
+    """
+    Push several tickets with one database write for the tickets and one for their assignments
+
+    Args:
+        tickets: Ticket instances to be saved
+
+    Returns:
+        ticket_id per input ticket, None where validation or saving failed
+    """
+    ticket_ids: List[Optional[str]] = [None] * len(tickets)
+    valid = [index for index, ticket in enumerate(tickets) if ticket.validate()]
+    if not valid:
+        return ticket_ids
+
+    try:
+        created = TicketData.create_many([tickets[index].ticket_data for index in valid])
+    except Exception as e:
+        logger.error(f"❌ Error in push_tickets: {e}")
+        return ticket_ids
+
+    for index, ticket_id in zip(valid, created):
+        ticket_ids[index] = ticket_id
+
+    # DON'T FAIL the tickets for assignment errors
+    try:
+        AssignmentData.create_many([
+            {
+                'ticket_id': tickets[index].ticket_data['ticket_id'],
+                'assigned_to': tickets[index].ticket_data['assigned_to'],
+                'assignment_group': tickets[index].ticket_data['assignment_group']
+            }
+            for index in valid
+        ])
+    except Exception as assignment_error:
+        logger.warning(f"Assignment creation failed (non-fatal): {assignment_error}")
+
+    logger.info(f"✅ Successfully pushed {len(created)} tickets")
+    return ticket_ids
+
 # Additional utility functions for ticket management
 
 def get_tickets_by_email(email_id: str) -> List[Dict[str, Any]]:
@@ -309,8 +357,7 @@ def get_open_tickets() -> List[Dict[str, Any]]:
 
 def get_ticket_statistics() -> Dict[str, Any]:
     """Get ticket statistics"""
-    from .models import get_ticket_statistics
-    return get_ticket_statistics()
+    return _ticket_statistics()
 
 # Batch operations
 def bulk_assign_tickets(ticket_ids: List[str], assigned_to: str, assignment_group: str = None) -> Dict[str, Any]:
@@ -335,17 +382,18 @@ def bulk_assign_tickets(ticket_ids: List[str], assigned_to: str, assignment_grou
 
 def bulk_update_status(ticket_ids: List[str], status: TicketStatus, notes: str = None) -> Dict[str, Any]:
     """Update status for multiple tickets"""
-    results = []
-    successful = 0
+    try:
+        # One table write for the whole batch instead of one per ticket
+        updated = set(TicketData.update_many(ticket_ids, _status_update_data(status, notes)))
+    except Exception as e:
+        logger.error(f"Error updating ticket status: {e}")
+        updated = set()
     
-    for ticket_id in ticket_ids:
-        success = Ticket.update_status(ticket_id, status, notes)
-        results.append({
-            'ticket_id': ticket_id,
-            'success': success
-        })
-        if success:
-            successful += 1
+    results = [
+        {'ticket_id': ticket_id, 'success': ticket_id in updated}
+        for ticket_id in ticket_ids
+    ]
+    successful = sum(1 for result in results if result['success'])
     
     return {
         'successful_count': successful,
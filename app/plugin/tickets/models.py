@@ -5,10 +5,17 @@ Handles ticket-related database operations and data structures
 
 from enum import Enum
 from tinydb import TinyDB, Query
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterable
+import copy
+import heapq
+import secrets
+import time
 import uuid
+from collections import Counter, OrderedDict, defaultdict
 from datetime import datetime
 
+from .text import tokenize
+
 # Initialize ticket-specific database tables
 try:
     from ...models import db
@@ -19,6 +26,38 @@ except ImportError:
 tickets_table = db.table('tickets')
 ticket_assignments_table = db.table('ticket_assignments')
 
+# Reusable query builders for the tables above
+TicketQuery = Query()
+AssignmentQuery = Query()
+
+# Running ticket counters, rebuilt lazily from the table on first use and
+# kept in sync by TicketData writes afterwards
+_stats: Dict[str, Any] = {
+    'total': 0,
+    'by_status': Counter(),
+    'by_category': Counter(),
+    'by_urgency': Counter(),
+}
+_stats_loaded = False
+_STATS_FIELDS = ('status', 'category', 'urgency')
+
+# Small TTL + LRU cache for ticket lookups by ID: ticket_id -> (expires_at, ticket)
+_ticket_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_TICKET_CACHE_TTL = 30.0
+_TICKET_CACHE_SIZE = 4096
+
+# Inverted index for ticket search, rebuilt lazily like the statistics:
+# token -> doc_ids, plus each ticket's lowercased searchable text by doc_id
+_search_postings: Dict[str, set] = defaultdict(set)
+_search_texts: Dict[int, str] = {}
+_search_loaded = False
+
+# Ticket fields covered by search
+SEARCH_FIELDS = (
+    'short_description', 'description', 'category',
+    'subcategory', 'unit_number', 'requested_for'
+)
+
 class TicketStatus(str, Enum):
     """Ticket status values"""
     NEW = "New"
@@ -27,6 +66,13 @@ class TicketStatus(str, Enum):
     RESOLVED = "Resolved"
     CLOSED = "Closed"
 
+# Statuses that count as open work
+OPEN_STATUSES = frozenset({
+    TicketStatus.NEW.value,
+    TicketStatus.IN_PROGRESS.value,
+    TicketStatus.PENDING.value
+})
+
 class TicketCategory(str, Enum):
     """Main ticket categories"""
     MAINTENANCE = "Maintenance"
@@ -82,6 +128,10 @@ class TicketRequestType(str, Enum):
     GENERAL = "General"
     EMERGENCY = "Emergency"
 
+def _new_ticket_id() -> str:
+    """Generate a ticket ID such as TKT-1A2B3C4D"""
+    return 'TKT-' + secrets.token_hex(4).upper()
+
 class TicketData:
     """Data access layer for tickets"""
     
@@ -91,69 +141,194 @@ class TicketData:
         try:
             # Generate ticket ID if not provided
             if 'ticket_id' not in ticket_data:
-                ticket_data['ticket_id'] = f"TKT-{str(uuid.uuid4())[:8].upper()}"
+                ticket_data['ticket_id'] = _new_ticket_id()
             
             # Add timestamps
-            ticket_data['created_at'] = datetime.now().isoformat()
-            ticket_data['updated_at'] = datetime.now().isoformat()
+            now = datetime.now().isoformat()
+            ticket_data['created_at'] = now
+            ticket_data['updated_at'] = now
             
             # Insert into database
-            tickets_table.insert(ticket_data)
+            doc_id = tickets_table.insert(ticket_data)
+            _count_ticket(ticket_data, 1)
+            _index_ticket(doc_id, ticket_data)
             
             return ticket_data['ticket_id']
             
         except Exception as e:
             raise Exception(f"Failed to create ticket: {str(e)}")
     
+    @staticmethod
+    def create_many(tickets: List[Dict[str, Any]]) -> List[str]:
+        """Create several tickets with a single database write"""
+        try:
+            now = datetime.now().isoformat()
+            for ticket_data in tickets:
+                if 'ticket_id' not in ticket_data:
+                    ticket_data['ticket_id'] = _new_ticket_id()
+                ticket_data['created_at'] = now
+                ticket_data['updated_at'] = now
+            
+            doc_ids = tickets_table.insert_multiple(tickets)
+            for doc_id, ticket_data in zip(doc_ids, tickets):
+                _count_ticket(ticket_data, 1)
+                _index_ticket(doc_id, ticket_data)
+            
+            return [ticket_data['ticket_id'] for ticket_data in tickets]
+            
+        except Exception as e:
+            raise Exception(f"Failed to create tickets: {str(e)}")
+    
     @staticmethod
     def get_by_id(ticket_id: str) -> Optional[Dict[str, Any]]:
         """Get ticket by ID"""
-        Ticket = Query()
-        return tickets_table.get(Ticket.ticket_id == ticket_id)
+        cached = _ticket_cache.get(ticket_id)
+        if cached is not None:
+            expires_at, ticket = cached
+            if expires_at > time.monotonic():
+                _ticket_cache.move_to_end(ticket_id)
+                return copy.deepcopy(ticket)
+            del _ticket_cache[ticket_id]
+        
+        ticket = tickets_table.get(TicketQuery.ticket_id == ticket_id)
+        if ticket is not None:
+            _ticket_cache[ticket_id] = (time.monotonic() + _TICKET_CACHE_TTL, ticket)
+            if len(_ticket_cache) > _TICKET_CACHE_SIZE:
+                _ticket_cache.popitem(last=False)
+            # Deep copy so callers editing nested fields like metadata cannot poison the cache
+            ticket = copy.deepcopy(ticket)
+        return ticket
     
     @staticmethod
     def update(ticket_id: str, update_data: Dict[str, Any]) -> bool:
         """Update ticket data"""
         try:
-            Ticket = Query()
-            update_data['updated_at'] = datetime.now().isoformat()
+            if 'updated_at' not in update_data:
+                update_data['updated_at'] = datetime.now().isoformat()
+            
+            # Only fetch the old row when a counted or searchable field is changing
+            old_ticket = None
+            if (
+                (_stats_loaded and any(field in update_data for field in _STATS_FIELDS)) or
+                (_search_loaded and any(field in update_data for field in SEARCH_FIELDS))
+            ):
+                old_ticket = tickets_table.get(TicketQuery.ticket_id == ticket_id)
+            
+            result = tickets_table.update(update_data, TicketQuery.ticket_id == ticket_id)
+            _ticket_cache.pop(ticket_id, None)
+            
+            if old_ticket is not None and result:
+                new_ticket = {**old_ticket, **update_data}
+                _count_ticket(old_ticket, -1)
+                _count_ticket(new_ticket, 1)
+                _index_ticket(old_ticket.doc_id, new_ticket)
             
-            result = tickets_table.update(update_data, Ticket.ticket_id == ticket_id)
             return len(result) > 0
             
         except Exception:
             return False
     
+    @staticmethod
+    def update_many(ticket_ids: List[str], update_data: Dict[str, Any]) -> List[str]:
+        """Apply the same update to several tickets with one table write, returning the IDs updated"""
+        try:
+            if 'updated_at' not in update_data:
+                update_data['updated_at'] = datetime.now().isoformat()
+            
+            old_tickets = tickets_table.search(TicketQuery.ticket_id.one_of(set(ticket_ids)))
+            if not old_tickets:
+                return []
+            
+            tickets_table.update(update_data, doc_ids=[ticket.doc_id for ticket in old_tickets])
+            updated_ids = [ticket.get('ticket_id') for ticket in old_tickets]
+            invalidate_ticket_cache(updated_ids)
+            
+            for old_ticket in old_tickets:
+                new_ticket = {**old_ticket, **update_data}
+                _count_ticket(old_ticket, -1)
+                _count_ticket(new_ticket, 1)
+                _index_ticket(old_ticket.doc_id, new_ticket)
+            
+            return updated_ids
+            
+        except Exception:
+            return []
+    
     @staticmethod
     def get_all(limit: int = 100, skip: int = 0) -> List[Dict[str, Any]]:
         """Get all tickets with pagination"""
-        all_tickets = tickets_table.all()
-        # Sort by created_at (most recent first)
-        sorted_tickets = sorted(
-            all_tickets, 
-            key=lambda x: x.get('created_at', ''), 
-            reverse=True
+        # Only keep the newest skip + limit tickets instead of sorting them all
+        newest_tickets = heapq.nlargest(
+            skip + limit,
+            tickets_table,
+            key=lambda x: x.get('created_at', '')
+        )
+        return newest_tickets[skip:]
+    
+    @staticmethod
+    def find(filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Get tickets whose fields equal all of the given values, newest first"""
+        # fragment() checks every filter in a single predicate per document
+        tickets = tickets_table.search(TicketQuery.fragment(filters)) if filters else tickets_table.all()
+        tickets.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+        return tickets
+    
+    @staticmethod
+    def search(query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Find tickets whose searchable fields contain the query, newest first"""
+        if not _search_loaded:
+            _load_search_index()
+        
+        query_lower = query.lower()
+        query_tokens = set(tokenize(query_lower))
+        
+        if query_tokens:
+            # Every query token must sit inside some token of a matching ticket,
+            # so intersect the postings of all index tokens containing it
+            candidates = None
+            for query_token in query_tokens:
+                doc_ids = set()
+                for token, postings in _search_postings.items():
+                    if query_token in token:
+                        doc_ids |= postings
+                candidates = doc_ids if candidates is None else candidates & doc_ids
+                if not candidates:
+                    return []
+        else:
+            candidates = _search_texts.keys()
+        
+        # Confirm the full query against the cached text before touching the table
+        matching_ids = sorted(doc_id for doc_id in candidates if query_lower in _search_texts[doc_id])
+        if not matching_ids:
+            return []
+        
+        return heapq.nlargest(
+            limit,
+            tickets_table.get(doc_ids=matching_ids),
+            key=lambda x: x.get('created_at', '')
         )
-        return sorted_tickets[skip:skip + limit]
     
     @staticmethod
     def get_by_status(status: TicketStatus) -> List[Dict[str, Any]]:
         """Get tickets by status"""
-        Ticket = Query()
-        return tickets_table.search(Ticket.status == status.value)
+        return tickets_table.search(TicketQuery.status == status.value)
     
     @staticmethod
     def get_by_email_id(email_id: str) -> List[Dict[str, Any]]:
         """Get tickets created from a specific email"""
-        Ticket = Query()
-        return tickets_table.search(Ticket.email_id == email_id)
+        return tickets_table.search(TicketQuery.email_id == email_id)
     
     @staticmethod
     def delete(ticket_id: str) -> bool:
         """Delete a ticket"""
         try:
-            Ticket = Query()
-            result = tickets_table.remove(Ticket.ticket_id == ticket_id)
+            removed = tickets_table.search(TicketQuery.ticket_id == ticket_id) if _stats_loaded else []
+            result = tickets_table.remove(TicketQuery.ticket_id == ticket_id)
+            _ticket_cache.pop(ticket_id, None)
+            for ticket in removed:
+                _count_ticket(ticket, -1)
+            for doc_id in result:
+                _unindex_ticket(doc_id)
             return len(result) > 0
         except Exception:
             return False
@@ -171,55 +346,127 @@ class AssignmentData:
         ticket_assignments_table.insert(assignment_data)
         return assignment_data['assignment_id']
     
+    @staticmethod
+    def create_many(assignments: List[Dict[str, Any]]) -> List[str]:
+        """Create several assignments with a single database write"""
+        now = datetime.now().isoformat()
+        for assignment_data in assignments:
+            assignment_data['assignment_id'] = str(uuid.uuid4())
+            assignment_data['assigned_at'] = now
+            assignment_data['status'] = 'active'
+        
+        ticket_assignments_table.insert_multiple(assignments)
+        return [assignment_data['assignment_id'] for assignment_data in assignments]
+    
     @staticmethod
     def get_by_ticket_id(ticket_id: str) -> List[Dict[str, Any]]:
         """Get assignments for a ticket"""
-        Assignment = Query()
-        return ticket_assignments_table.search(Assignment.ticket_id == ticket_id)
+        return ticket_assignments_table.search(AssignmentQuery.ticket_id == ticket_id)
     
     @staticmethod
     def update_status(assignment_id: str, status: str) -> bool:
         """Update assignment status"""
         try:
-            Assignment = Query()
             result = ticket_assignments_table.update(
                 {'status': status, 'updated_at': datetime.now().isoformat()},
-                Assignment.assignment_id == assignment_id
+                AssignmentQuery.assignment_id == assignment_id
             )
             return len(result) > 0
         except Exception:
             return False
 
+def _count_ticket(ticket: Dict[str, Any], delta: int) -> None:
+    """Apply a ticket to the running statistics (delta is +1 or -1)"""
+    if not _stats_loaded:
+        return
+    _stats['total'] += delta
+    _stats['by_status'][ticket.get('status', 'Unknown')] += delta
+    _stats['by_category'][ticket.get('category', 'Unknown')] += delta
+    _stats['by_urgency'][ticket.get('urgency', 'Unknown')] += delta
+
+def _load_statistics() -> None:
+    """Rebuild the running statistics with a single table scan"""
+    global _stats_loaded
+    
+    all_tickets = tickets_table.all()
+    _stats['total'] = len(all_tickets)
+    _stats['by_status'] = Counter(t.get('status', 'Unknown') for t in all_tickets)
+    _stats['by_category'] = Counter(t.get('category', 'Unknown') for t in all_tickets)
+    _stats['by_urgency'] = Counter(t.get('urgency', 'Unknown') for t in all_tickets)
+    _stats_loaded = True
+
+def invalidate_ticket_statistics() -> None:
+    """Force a rebuild on next read (use after bulk writes that bypass TicketData)"""
+    global _stats_loaded
+    _stats_loaded = False
+
+def _search_text(ticket: Dict[str, Any]) -> str:
+    """Lowercased text that search queries are matched against"""
+    return '\n'.join([str(ticket.get(field, '')) for field in SEARCH_FIELDS]).lower()
+
+def _unindex_ticket(doc_id: int) -> None:
+    """Remove a ticket from the search index"""
+    if not _search_loaded:
+        return
+    text = _search_texts.pop(doc_id, None)
+    if text is None:
+        return
+    for token in set(tokenize(text)):
+        postings = _search_postings.get(token)
+        if postings is not None:
+            postings.discard(doc_id)
+            if not postings:
+                del _search_postings[token]
+
+def _index_ticket(doc_id: int, ticket: Dict[str, Any]) -> None:
+    """Add (or refresh) a ticket in the search index"""
+    if not _search_loaded:
+        return
+    _unindex_ticket(doc_id)
+    text = _search_text(ticket)
+    _search_texts[doc_id] = text
+    for token in set(tokenize(text)):
+        _search_postings[token].add(doc_id)
+
+def _load_search_index() -> None:
+    """Build the search index with a single table scan"""
+    global _search_loaded
+    
+    _search_postings.clear()
+    _search_texts.clear()
+    _search_loaded = True
+    for ticket in tickets_table:
+        _index_ticket(ticket.doc_id, ticket)
+
+def invalidate_search_index() -> None:
+    """Force a rebuild of the search index on next search"""
+    global _search_loaded
+    _search_loaded = False
+
+def invalidate_ticket_cache(ticket_ids: Optional[Iterable[str]] = None) -> None:
+    """Drop cached ticket lookups (all of them when no IDs are given)"""
+    if ticket_ids is None:
+        _ticket_cache.clear()
+        return
+    for ticket_id in ticket_ids:
+        _ticket_cache.pop(ticket_id, None)
+
 def get_ticket_statistics() -> Dict[str, Any]:
     """Get comprehensive ticket statistics"""
-    all_tickets = tickets_table.all()
+    if not _stats_loaded:
+        _load_statistics()
     
-    stats = {
-        'total_tickets': len(all_tickets),
-        'by_status': {},
-        'by_category': {},
-        'by_urgency': {},
-        'open_tickets': 0,
-        'closed_tickets': 0
-    }
+    def _nonzero(counter: Counter) -> Dict[str, int]:
+        return {key: count for key, count in counter.items() if count > 0}
     
-    for ticket in all_tickets:
-        # Count by status
-        status = ticket.get('status', 'Unknown')
-        stats['by_status'][status] = stats['by_status'].get(status, 0) + 1
-        
-        # Count by category
-        category = ticket.get('category', 'Unknown')
-        stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
-        
-        # Count by urgency
-        urgency = ticket.get('urgency', 'Unknown')
-        stats['by_urgency'][urgency] = stats['by_urgency'].get(urgency, 0) + 1
-        
-        # Count open/closed
-        if status in ['New', 'In Progress', 'Pending']:
-            stats['open_tickets'] += 1
-        else:
-            stats['closed_tickets'] += 1
+    by_status = _nonzero(_stats['by_status'])
+    open_tickets = sum(by_status.get(status, 0) for status in OPEN_STATUSES)
     
-    return stats
\ No newline at end of file
+    return {
+        'total_tickets': _stats['total'],
+        'by_status': by_status,
+        'by_category': _nonzero(_stats['by_category']),
+        'by_urgency': _nonzero(_stats['by_urgency']),
+        'open_tickets': open_tickets,
+        'closed_tickets': _stats['total'] - open_tickets
+    }
@@ -5,7 +5,9 @@ Handles ticket data validation and mapping from email content
 
 from typing import Dict, Any, Optional, Tuple
 from .models import TicketCategory, TicketSubcategory, TicketUrgency, TicketRequestType
+from .text import tokenize
 import re
+from functools import lru_cache
 
 class TicketSchemaValidator:
     """Validates and transforms data according to ticket schema"""
@@ -16,15 +18,12 @@ class TicketSchemaValidator:
         'unit_number', 'requested_for', 'assignment_group', 
         'assigned_to', 'status'
     ]
+    _REQUIRED_SET = frozenset(REQUIRED_FIELDS)
     
     @classmethod
     def validate_ticket_data(cls, ticket_data: Dict[str, Any]) -> Tuple[bool, list]:
         """Validate ticket data against schema requirements"""
-        missing_fields = []
-        
-        for field in cls.REQUIRED_FIELDS:
-            if field not in ticket_data or ticket_data[field] is None:
-                missing_fields.append(field)
+        missing_fields = [field for field in cls.REQUIRED_FIELDS if ticket_data.get(field) is None]
         
         return len(missing_fields) == 0, missing_fields
     
@@ -61,12 +60,49 @@ class TicketSchemaValidator:
         }
         
         # Add optional fields
-        for key, value in kwargs.items():
-            if key not in cls.REQUIRED_FIELDS:
-                ticket_schema[key] = value
+        if kwargs:
+            ticket_schema.update(
+                {key: value for key, value in kwargs.items() if key not in cls._REQUIRED_SET}
+            )
         
         return ticket_schema
 
+def _compile_keywords(keywords) -> Tuple[frozenset, tuple]:
+    """Split keywords into single words (matched against token stems) and phrases"""
+    words = frozenset(keyword for keyword in keywords if ' ' not in keyword)
+    phrases = tuple(keyword for keyword in keywords if ' ' in keyword)
+    return words, phrases
+
+def _index_keywords(keyword_lists) -> Tuple[Dict[str, int], tuple]:
+    """Flatten ordered keyword lists into word -> priority and (priority, phrase) pairs"""
+    word_priority: Dict[str, int] = {}
+    phrases = []
+    for priority, keywords in enumerate(keyword_lists):
+        for keyword in keywords:
+            if ' ' in keyword:
+                phrases.append((priority, keyword))
+            else:
+                # Earlier lists win for keywords listed more than once
+                word_priority.setdefault(keyword, priority)
+    return word_priority, tuple(phrases)
+
+# Endings a keyword may carry at the start of a token and still match, so
+# 'complain' hits 'complaint' and 'leak' hits 'leaking' but 'fix' skips 'fixture'
+_INFLECTIONS = (
+    's', 'es', "'s", "s'", 'd', 'ed', 'ing', 'ings', 'er', 'ers', 'ly', 'y', 't', 'ts', 'al'
+)
+
+def _tokenize(content_lower: str) -> set:
+    """Split lowercased content into a set of word tokens and their stems"""
+    tokens = set(tokenize(content_lower))
+    tokens.update([
+        token[:-len(ending)]
+        for token in tokens
+        for ending in _INFLECTIONS
+        if token.endswith(ending) and len(token) > len(ending)
+    ])
+    return tokens
+
 class CategoryMapper:
     """Maps email content to appropriate ticket categories"""
     
@@ -133,73 +169,149 @@ class CategoryMapper:
         ]
     }
     
+    # Ordered (subcategory, keywords) rules per category; first match wins
+    SUBCATEGORY_KEYWORDS = {
+        TicketCategory.MAINTENANCE.value: (
+            (TicketSubcategory.PLUMBING.value,
+             ('toilet', 'sink', 'faucet', 'pipe', 'leak', 'water')),
+            (TicketSubcategory.ELECTRICAL.value,
+             ('electrical', 'outlet', 'switch', 'power', 'light')),
+            (TicketSubcategory.HVAC.value,
+             ('hvac', 'heating', 'cooling', 'air conditioning', 'furnace')),
+            (TicketSubcategory.APPLIANCE.value,
+             ('refrigerator', 'stove', 'oven', 'dishwasher', 'appliance')),
+            (TicketSubcategory.CLEANING.value,
+             ('clean', 'dirty', 'trash', 'pest')),
+        ),
+        TicketCategory.COMPLAINT.value: (
+            (TicketSubcategory.NOISE_COMPLAINT.value, ('noise', 'loud', 'music', 'party')),
+            (TicketSubcategory.NEIGHBOR_DISPUTE.value, ('neighbor', 'dispute', 'conflict')),
+        ),
+        TicketCategory.PAYMENT.value: (
+            (TicketSubcategory.LATE_FEES.value, ('late fee', 'penalty')),
+        ),
+        TicketCategory.AMENITY.value: (
+            (TicketSubcategory.POOL.value, ('pool',)),
+            (TicketSubcategory.GYM.value, ('gym',)),
+            (TicketSubcategory.PARKING.value, ('parking',)),
+        ),
+    }
+    
+    # Subcategory used when no rule for the category matches
+    SUBCATEGORY_DEFAULTS = {
+        TicketCategory.MAINTENANCE.value: TicketSubcategory.GENERAL_REPAIR.value,
+        TicketCategory.PAYMENT.value: TicketSubcategory.RENT_PAYMENT.value,
+    }
+    
+    # Keyword tables split into word sets and phrase lists once at import
+    _CATEGORY_RULES = tuple(
+        (_compile_keywords(info['keywords']), info['category'], info['request_type'])
+        for info in CATEGORY_KEYWORDS.values()
+    )
+    # Flat keyword -> bucket priority index looked up by token stem; the lowest priority hit wins
+    _CATEGORY_WORDS, _CATEGORY_PHRASES = _index_keywords(
+        [info['keywords'] for info in CATEGORY_KEYWORDS.values()]
+    )
+    _SUBCATEGORY_RULES = {
+        category: tuple((_compile_keywords(keywords), subcategory) for subcategory, keywords in rules)
+        for category, rules in SUBCATEGORY_KEYWORDS.items()
+    }
+    _URGENCY_RULES = tuple(
+        (_compile_keywords(keywords), urgency)
+        for urgency, keywords in URGENCY_KEYWORDS.items()
+    )
+    
+    @staticmethod
+    def _matches(tokens: set, content_lower: str, keywords: Tuple[frozenset, tuple]) -> bool:
+        """Check for a keyword at the start of a token or a keyword phrase in the content"""
+        words, phrases = keywords
+        return not words.isdisjoint(tokens) or any(phrase in content_lower for phrase in phrases)
+    
     @classmethod
-    def determine_category_from_content(cls, content: str) -> Tuple[str, str]:
-        """Determine category and request type from email content"""
-        content_lower = content.lower()
+    def _category(cls, content_lower: str, tokens: set) -> Tuple[str, str]:
+        """Category and request type for pre-lowered, pre-tokenized content"""
+        priority = min(
+            (cls._CATEGORY_WORDS[word] for word in cls._CATEGORY_WORDS.keys() & tokens),
+            default=len(cls._CATEGORY_RULES)
+        )
+        # Phrases only matter if they belong to a higher priority bucket
+        for phrase_priority, phrase in cls._CATEGORY_PHRASES:
+            if phrase_priority < priority and phrase in content_lower:
+                priority = phrase_priority
+                break
         
-        for category_type, info in cls.CATEGORY_KEYWORDS.items():
-            if any(keyword in content_lower for keyword in info['keywords']):
-                return info['category'], info['request_type']
+        if priority < len(cls._CATEGORY_RULES):
+            _, category, request_type = cls._CATEGORY_RULES[priority]
+            return category, request_type
         
         # Default fallback
         return TicketCategory.MAINTENANCE.value, TicketRequestType.GENERAL.value
     
+    @classmethod
+    def _subcategory(cls, content_lower: str, tokens: set, category: str) -> str:
+        """Subcategory for pre-lowered, pre-tokenized content"""
+        for keywords, subcategory in cls._SUBCATEGORY_RULES.get(category, ()):
+            if cls._matches(tokens, content_lower, keywords):
+                return subcategory
+        
+        return cls.SUBCATEGORY_DEFAULTS.get(category, TicketSubcategory.OTHER.value)
+    
+    @classmethod
+    def _urgency(cls, content_lower: str, tokens: set) -> str:
+        """Urgency for pre-lowered, pre-tokenized content"""
+        for keywords, urgency in cls._URGENCY_RULES:
+            if cls._matches(tokens, content_lower, keywords):
+                return urgency
+        
+        return TicketUrgency.LOW.value
+    
+    @classmethod
+    def classify(cls, content: str, lowered: bool = False) -> Dict[str, str]:
+        """Determine category, request type, subcategory and urgency in one pass (pass lowered=True if already lowercased)"""
+        category, request_type, subcategory, urgency = classify_content(
+            content if lowered else content.lower()
+        )
+        return {
+            'category': category,
+            'request_type': request_type,
+            'subcategory': subcategory,
+            'urgency': urgency
+        }
+    
+    @classmethod
+    def determine_category_from_content(cls, content: str) -> Tuple[str, str]:
+        """Determine category and request type from email content"""
+        content_lower = content.lower()
+        return cls._category(content_lower, _tokenize(content_lower))
+    
     @classmethod
     def determine_subcategory(cls, content: str, category: str) -> str:
         """Determine specific subcategory based on content and category"""
         content_lower = content.lower()
-        
-        if category == TicketCategory.MAINTENANCE.value:
-            if any(keyword in content_lower for keyword in ['toilet', 'sink', 'faucet', 'pipe', 'leak', 'water']):
-                return TicketSubcategory.PLUMBING.value
-            elif any(keyword in content_lower for keyword in ['electrical', 'outlet', 'switch', 'power', 'light']):
-                return TicketSubcategory.ELECTRICAL.value
-            elif any(keyword in content_lower for keyword in ['hvac', 'heating', 'cooling', 'air conditioning', 'furnace']):
-                return TicketSubcategory.HVAC.value
-            elif any(keyword in content_lower for keyword in ['refrigerator', 'stove', 'oven', 'dishwasher', 'appliance']):
-                return TicketSubcategory.APPLIANCE.value
-            elif any(keyword in content_lower for keyword in ['clean', 'dirty', 'trash', 'pest']):
-                return TicketSubcategory.CLEANING.value
-            else:
-                return TicketSubcategory.GENERAL_REPAIR.value
-        
-        elif category == TicketCategory.COMPLAINT.value:
-            if any(keyword in content_lower for keyword in ['noise', 'loud', 'music', 'party']):
-                return TicketSubcategory.NOISE_COMPLAINT.value
-            elif any(keyword in content_lower for keyword in ['neighbor', 'dispute', 'conflict']):
-                return TicketSubcategory.NEIGHBOR_DISPUTE.value
-            else:
-                return TicketSubcategory.OTHER.value
-        
-        elif category == TicketCategory.PAYMENT.value:
-            if any(keyword in content_lower for keyword in ['late fee', 'penalty']):
-                return TicketSubcategory.LATE_FEES.value
-            else:
-                return TicketSubcategory.RENT_PAYMENT.value
-        
-        elif category == TicketCategory.AMENITY.value:
-            if 'pool' in content_lower:
-                return TicketSubcategory.POOL.value
-            elif 'gym' in content_lower:
-                return TicketSubcategory.GYM.value
-            elif 'parking' in content_lower:
-                return TicketSubcategory.PARKING.value
-            else:
-                return TicketSubcategory.OTHER.value
-        
-        return TicketSubcategory.OTHER.value
+        return cls._subcategory(content_lower, _tokenize(content_lower), category)
     
     @classmethod
     def determine_urgency(cls, content: str) -> str:
         """Determine urgency level from content"""
         content_lower = content.lower()
-        
-        for urgency, keywords in cls.URGENCY_KEYWORDS.items():
-            if any(keyword in content_lower for keyword in keywords):
-                return urgency
-        
-        return TicketUrgency.LOW.value
+        return cls._urgency(content_lower, _tokenize(content_lower))
+
+@lru_cache(maxsize=1024)
+def classify_content(content_lower: str) -> Tuple[str, str, str, str]:
+    """
+    Classify already lowercased email content as (category, request_type, subcategory, urgency)
+    
+    Memoized because templated and auto-generated emails repeat verbatim
+    """
+    tokens = _tokenize(content_lower)
+    
+    category, request_type = CategoryMapper._category(content_lower, tokens)
+    return (
+        category,
+        request_type,
+        CategoryMapper._subcategory(content_lower, tokens, category),
+        CategoryMapper._urgency(content_lower, tokens)
+    )
 
 class PropertyInfoExtractor:
     """Extracts property and unit information from email content"""
@@ -213,19 +325,33 @@ class PropertyInfoExtractor:
         r'suite\s*(\w+)'
     ]
     
+    UNIT_NOT_SPECIFIED = "Unit not specified"
+    
+    # Compiled once and matched against lowercased content: case-sensitive
+    # patterns keep their literal-prefix fast path, which IGNORECASE disables
+    _UNIT_REGEXES = tuple(re.compile(pattern) for pattern in UNIT_PATTERNS)
+    
     @classmethod
-    def extract_unit_info(cls, content: str) -> str:
-        """Extract unit information from email content"""
-        for pattern in cls.UNIT_PATTERNS:
-            match = re.search(pattern, content, re.IGNORECASE)
+    def extract_unit_info(cls, content: str, lowered: bool = False) -> str:
+        """Extract unit information from email content (pass lowered=True if already lowercased)"""
+        content_lower = content if lowered else content.lower()
+        for regex in cls._UNIT_REGEXES:
+            match = regex.search(content_lower)
             if match:
                 return f"Unit {match.group(1).upper()}"
         
-        return "Unit not specified"
+        return cls.UNIT_NOT_SPECIFIED
     
     @classmethod
     def generate_property_id(cls, unit_info: str) -> str:
         """Generate property ID from unit information"""
+        if unit_info == cls.UNIT_NOT_SPECIFIED:
+            return "P000"
+        
+        # Fast path for extract_unit_info output: "Unit " + a single word
+        if unit_info.startswith('Unit ') and ' ' not in unit_info[5:]:
+            return f"P{unit_info[5:8].zfill(3)}"
+        
         if 'Unit' in unit_info:
             # Extract unit number and create property ID
             unit_num = unit_info.replace('Unit ', '').strip()
@@ -0,0 +1,35 @@
+"""
+Text helpers shared by ticket classification and search
+Tokenizes content with a character lookup table instead of a regex
+"""
+
+from typing import List
+
+class _TokenTable(dict):
+    """
+    str.translate table mapping every non-word code point to a space
+
+    Anything but letters, digits (str.isalnum) and apostrophes is a
+    separator, including emoji and CJK punctuation. Entries are filled in
+    on first lookup, so only code points that actually occur are stored.
+    """
+
+    def __missing__(self, code: int) -> int:
+        char = chr(code)
+        value = code if char.isalnum() or char == "'" else ord(' ')
+        self[code] = value
+        return value
+
+_TOKEN_TABLE = _TokenTable()
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into word tokens
+
+    Args:
+        text: Text to split (callers pass it already lowercased)
+
+    Returns:
+        Tokens in order of appearance
+    """
+    return text.translate(_TOKEN_TABLE).split()
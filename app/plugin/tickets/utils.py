@@ -3,49 +3,61 @@ Utility functions for ticket operations
 Helper functions and cleanup utilities
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterable, Iterator, Optional
 from datetime import datetime, timedelta
+import csv
 import logging
+import re
 
-from .models import TicketData, tickets_table, ticket_assignments_table, TicketStatus
-from tinydb import Query
+from .models import (
+    TicketData, tickets_table, ticket_assignments_table, TicketStatus, OPEN_STATUSES,
+    invalidate_ticket_statistics, invalidate_ticket_cache, invalidate_search_index,
+    TicketQuery, AssignmentQuery, get_ticket_statistics
+)
 
 logger = logging.getLogger(__name__)
 
-def cleanup_old_tickets(days_old: int = 90) -> int:
+# Display name in front of an address: "John Doe <john@example.com>"
+_ANGLE_RE = re.compile(r'^\s*([^<\s][^<]*?)\s*<')
+# Separators in an address local part that become spaces in a name
+_NAME_TABLE = str.maketrans({'.': ' ', '_': ' '})
+
+def cleanup_old_tickets(days_old: int = 90, now: Optional[datetime] = None) -> int:
     """
     Clean up old closed tickets
     
     Args:
         days_old: Remove tickets closed more than this many days ago
+        now: Reference time (defaults to the current time)
         
     Returns:
         Number of tickets cleaned up
     """
     try:
-        cutoff_date = (datetime.now() - timedelta(days=days_old)).isoformat()
+        now = now or datetime.now()
+        cutoff_date = (now - timedelta(days=days_old)).isoformat()
         
-        Ticket = Query()
         old_tickets = tickets_table.search(
-            (Ticket.status == TicketStatus.CLOSED.value) & 
-            (Ticket.closed_at < cutoff_date)
+            (TicketQuery.status == TicketStatus.CLOSED.value) & 
+            (TicketQuery.closed_at < cutoff_date)
         )
         
-        old_ticket_ids = [ticket['ticket_id'] for ticket in old_tickets]
+        if not old_tickets:
+            return 0
         
-        # Remove associated assignment records
-        Assignment = Query()
-        for ticket_id in old_ticket_ids:
-            ticket_assignments_table.remove(Assignment.ticket_id == ticket_id)
+        old_ticket_ids = {ticket['ticket_id'] for ticket in old_tickets}
         
-        # Remove old tickets
-        tickets_table.remove(
-            (Ticket.status == TicketStatus.CLOSED.value) & 
-            (Ticket.closed_at < cutoff_date)
-        )
+        # Remove associated assignment records in one pass
+        ticket_assignments_table.remove(AssignmentQuery.ticket_id.one_of(old_ticket_ids))
+        
+        # Remove old tickets by document ID instead of re-evaluating the query
+        tickets_table.remove(doc_ids=[ticket.doc_id for ticket in old_tickets])
+        invalidate_ticket_statistics()
+        invalidate_ticket_cache(old_ticket_ids)
+        invalidate_search_index()
         
-        logger.info(f"Cleaned up {len(old_ticket_ids)} old tickets")
-        return len(old_ticket_ids)
+        logger.info(f"Cleaned up {len(old_tickets)} old tickets")
+        return len(old_tickets)
         
     except Exception as e:
         logger.error(f"Error cleaning up old tickets: {e}")
@@ -104,15 +116,13 @@ def extract_tenant_name(sender_email: str) -> str:
     """
     try:
         # Handle emails with names: "John Doe <john@example.com>"
-        if '<' in sender_email:
-            name_part = sender_email.split('<')[0].strip()
-            if name_part:
-                return name_part
+        match = _ANGLE_RE.match(sender_email)
+        if match:
+            return match.group(1)
         
         # Extract from email address: "john.doe@example.com" -> "John Doe"
         local_part = sender_email.split('@')[0]
-        name = local_part.replace('.', ' ').replace('_', ' ').title()
-        return name
+        return local_part.translate(_NAME_TABLE).title()
         
     except Exception:
         return "Tenant"
@@ -128,71 +138,64 @@ def format_ticket_summary(ticket: Dict[str, Any]) -> str:
         Formatted summary string
     """
     try:
-        summary = f"Ticket {ticket.get('ticket_id', 'Unknown')}: "
-        summary += f"{ticket.get('short_description', 'No description')[:50]}... "
-        summary += f"[{ticket.get('category', 'Unknown')}/{ticket.get('urgency', 'Unknown')}] "
-        summary += f"Status: {ticket.get('status', 'Unknown')} "
-        summary += f"Assigned: {ticket.get('assigned_to', 'Unassigned')}"
-        
-        return summary
+        get = ticket.get
+        return (
+            f"Ticket {get('ticket_id', 'Unknown')}: "
+            f"{get('short_description', 'No description')[:50]}... "
+            f"[{get('category', 'Unknown')}/{get('urgency', 'Unknown')}] "
+            f"Status: {get('status', 'Unknown')} "
+            f"Assigned: {get('assigned_to', 'Unassigned')}"
+        )
         
     except Exception:
         return f"Ticket {ticket.get('ticket_id', 'Unknown')}: [Error formatting summary]"
 
-def get_tickets_requiring_attention() -> List[Dict[str, Any]]:
+def get_tickets_requiring_attention(now: Optional[datetime] = None) -> List[Dict[str, Any]]:
     """
     Get tickets that require immediate attention
     
+    Args:
+        now: Reference time (defaults to the current time)
+    
     Returns:
         List of high priority or overdue tickets
     """
     try:
-        # Get all open tickets
-        Ticket = Query()
-        open_tickets = tickets_table.search(
-            Ticket.status.one_of(['New', 'In Progress', 'Pending'])
+        # New tickets created before this cutoff have gone more than a full
+        # day without progress (same threshold as timedelta.days > 1)
+        now = now or datetime.now()
+        cutoff_date = (now - timedelta(days=2)).isoformat()
+        
+        # Let TinyDB apply both conditions in its own scan
+        return tickets_table.search(
+            TicketQuery.status.one_of(OPEN_STATUSES) &
+            (
+                (TicketQuery.urgency == '1') |
+                ((TicketQuery.status == 'New') & (TicketQuery.created_at <= cutoff_date))
+            )
         )
         
-        attention_tickets = []
-        current_time = datetime.now()
-        
-        for ticket in open_tickets:
-            # High urgency tickets
-            if ticket.get('urgency') == '1':
-                attention_tickets.append(ticket)
-                continue
-            
-            # Tickets older than 24 hours without progress
-            created_at = ticket.get('created_at')
-            if created_at:
-                try:
-                    created_time = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                    if (current_time - created_time).days > 1 and ticket.get('status') == 'New':
-                        attention_tickets.append(ticket)
-                except Exception:
-                    continue
-        
-        return attention_tickets
-        
     except Exception as e:
         logger.error(f"Error getting tickets requiring attention: {e}")
         return []
 
-def generate_ticket_report() -> Dict[str, Any]:
+def generate_ticket_report(now: Optional[datetime] = None) -> Dict[str, Any]:
     """
     Generate a comprehensive ticket report
     
+    Args:
+        now: Reference time (defaults to the current time)
+    
     Returns:
         Dictionary with ticket statistics and summaries
     """
     try:
-        from .models import get_ticket_statistics
-        
+        now = now or datetime.now()
         stats = get_ticket_statistics()
-        attention_tickets = get_tickets_requiring_attention()
+        attention_tickets = get_tickets_requiring_attention(now)
         
         report = {
-            'generated_at': datetime.now().isoformat(),
+            'generated_at': now.isoformat(),
             'statistics': stats,
             'tickets_requiring_attention': len(attention_tickets),
             'attention_ticket_details': [
@@ -233,34 +236,56 @@ def search_tickets(query: str, limit: int = 20) -> List[Dict[str, Any]]:
         List of matching tickets
     """
     try:
-        query_lower = query.lower()
-        all_tickets = TicketData.get_all(limit=1000)  # Get more for searching
-        
-        matching_tickets = []
-        
-        for ticket in all_tickets:
-            # Search in multiple fields
-            searchable_text = f"""
-                {ticket.get('short_description', '')}
-                {ticket.get('description', '')}
-                {ticket.get('category', '')}
-                {ticket.get('subcategory', '')}
-                {ticket.get('unit_number', '')}
-                {ticket.get('requested_for', '')}
-            """.lower()
-            
-            if query_lower in searchable_text:
-                matching_tickets.append(ticket)
-                
-                if len(matching_tickets) >= limit:
-                    break
-        
-        return matching_tickets
+        return TicketData.search(query, limit)
         
     except Exception as e:
         logger.error(f"Error searching tickets: {e}")
         return []
 
+# Columns written by the CSV export
+CSV_HEADERS = [
+    'ticket_id', 'short_description', 'category', 'subcategory',
+    'urgency', 'status', 'property_id', 'unit_number',
+    'requested_for', 'assigned_to', 'created_at'
+]
+
+class _LineBuffer:
+    """File-like sink that keeps only the last line a csv writer produced"""
+    
+    def __init__(self):
+        self.line = ''
+    
+    def write(self, line: str) -> None:
+        self.line = line
+
+def iter_tickets_csv(tickets: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Export tickets to CSV one line at a time
+    
+    Args:
+        tickets: Iterable of ticket dictionaries
+        
+    Yields:
+        CSV lines, header first (nothing at all when there are no tickets)
+    """
+    tickets = iter(tickets)
+    first_ticket = next(tickets, None)
+    if first_ticket is None:
+        return
+    
+    buffer = _LineBuffer()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_HEADERS, extrasaction='ignore')
+    
+    writer.writeheader()
+    yield buffer.line
+    
+    writer.writerow(first_ticket)
+    yield buffer.line
+    
+    for ticket in tickets:
+        writer.writerow(ticket)
+        yield buffer.line
+
 def export_tickets_to_csv(tickets: List[Dict[str, Any]]) -> str:
     """
     Export tickets to CSV format
@@ -272,29 +297,8 @@ def export_tickets_to_csv(tickets: List[Dict[str, Any]]) -> str:
         CSV content as string
     """
     try:
-        import csv
-        import io
-        
-        output = io.StringIO()
-        
-        if not tickets:
-            return ""
-        
-        # Define CSV headers
-        headers = [
-            'ticket_id', 'short_description', 'category', 'subcategory',
-            'urgency', 'status', 'property_id', 'unit_number',
-            'requested_for', 'assigned_to', 'created_at'
-        ]
-        
-        writer = csv.DictWriter(output, fieldnames=headers, extrasaction='ignore')
-        writer.writeheader()
-        
-        for ticket in tickets:
-            writer.writerow(ticket)
-        
-        return output.getvalue()
+        return ''.join(iter_tickets_csv(tickets))
         
     except Exception as e:
         logger.error(f"Error exporting tickets to CSV: {e}")
-        return ""
\ No newline at end of file
+        return ""